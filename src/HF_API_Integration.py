@@ -1,8 +1,39 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
 from license_compat import license_compat
 
+# Successful license lookups keyed by model_id, least recently used first;
+# errors are not cached so a transient failure can be retried later in the
+# same run.
+_LICENSE_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_LICENSE_CACHE_MAXSIZE = 2048
+_LICENSE_CACHE_LOCK = threading.Lock()
+
 def get_license_info(model_id: str) -> dict:
     """
     Fetch license info and LGPLv2.1 compatibility for a Hugging Face model.
     Returns a dict with model_id, license, lgplv21_compat_score, and error (if any).
+    Results are memoized per model_id (LRU, up to 2048 models). A cached
+    result reports the lookup's own license_latency, not the original fetch's.
     """
-    return license_compat(model_id)
\ No newline at end of file
+    start = time.perf_counter()
+    with _LICENSE_CACHE_LOCK:
+        cached = _LICENSE_CACHE.get(model_id)
+        if cached is not None:
+            _LICENSE_CACHE.move_to_end(model_id)
+    if cached is not None:
+        info = dict(cached)
+        if "license_latency" in info:
+            info["license_latency"] = time.perf_counter() - start
+        return info
+    info = license_compat(model_id)
+    if isinstance(info, dict) and "error" not in info:
+        with _LICENSE_CACHE_LOCK:
+            _LICENSE_CACHE[model_id] = dict(info)
+            _LICENSE_CACHE.move_to_end(model_id)
+            while len(_LICENSE_CACHE) > _LICENSE_CACHE_MAXSIZE:
+                _LICENSE_CACHE.popitem(last=False)
+    return info
@@ -1,8 +1,121 @@
 import os
-import requests
 import re
 import json
-from typing import Dict, Any
+from typing import Any, Dict, Optional
+
+import requests
+
+import llm_cache
+from http_session import SESSION, json_loads
+
+GENAI_URL = "https://genai.rcac.purdue.edu/api/chat/completions"
+GENAI_MODEL = "llama3.1:latest"
+
+
+# Prompt templates are built once at import: the static instructions are a
+# single constant and only the per-model tail is filled in on each call.
+_METRICS_PROMPT_HEAD = (
+    "You are an expert evaluator. Return ONLY a JSON object with exactly these keys (all lower case):\n"
+    "- ramp_up_time (float in [0,1])\n"
+    "- ramp_up_time_latency (int milliseconds)\n"
+    "- performance_claims (float in [0,1])\n"
+    "- performance_claims_latency (int milliseconds)\n"
+    "- bus_factor (float in [0,1])\n"
+    "- bus_factor_latency (int milliseconds)\n"
+    "- dataset_quality (float in [0,1])\n"
+    "- dataset_quality_latency (int milliseconds)\n"
+    "- code_quality (float in [0,1])\n"
+    "- code_quality_latency (int milliseconds)\n\n"
+    "Metric Operationalization: In all the below metric, 0 means the absolute worst and 1 means the best.\n"
+    "- Ramp Up Time: Assess ease of getting started from README/tutorials/examples.\n"
+    "- Performance Claims: Check README/paper claims and whether they cite/align with recognized benchmarks; score verified/credible claims higher.\n"
+    "- Bus Factor: Analyze Git commit history using a Git library (such as isomorphic-git). Compute knowledge concentration: number of commits per contributor. Normalize to [0, 1] where higher = spread across more contributors. Mitigates risk of knowledge loss if a key contributor leaves, as measurable via repository metadata.\n"
+    "- Dataset Quality:  For this metric, you are a strict software and dataset auditor; analyze the provided model documentation (README,model card) and assign harsh 0.0–1.0 scores that severely penalize missing, vague, or incomplete information, never guessing or rewarding absence. If a dataset link provided by user is present, fully evaluate its quality using the listed evaluation. If the link is missing, go to the provided model link and check the Model card for training data(dataset) info; if a valid training dataset info is found, proceed with evaluation, otherwise set the score to 0. Evaluation: Check the listed dataset used for the model, specifically the: size, completeness, labels, license. Assess for cleanliness, relevance, and proper formatting. Normalize score [0, 1] based on quality indicators.\n"
+    "- Code Quality: For this metric, you are a strict software and dataset auditor; analyze the provided model documentation (README,model card) and assign harsh 0.0–1.0 scores that severely penalize missing, vague, or incomplete information, never guessing or rewarding absence. If a code link is provided by user present, fully evaluate code quality using the listed evaluation. If the link is missing, go to the provided model link and check for code files in the Files and version; if files exist, proceed with evaluation, otherwise set the score to 0. Evaluation: Static analysis with flake8, mypy type checking, and PEP8 compliance. Optionally, run example scripts to detect runtime errors. Normalize score [0, 1] based on linting results and maintainability.\n\n"
+    "Strict output rules:\n"
+    "- Output ONLY JSON. No code fences, no commentary.\n"
+    "- Latencies must be integers in milliseconds and rounded to zero decimal places.\n"
+    "- All metric names must be lower case and match exactly.\n"
+    "- Do NOT include dataset URLs in this response.\n\n"
+)
+_METRICS_PROMPT_TAIL = (
+    "Model (may be a full HF URL or <owner>/<name>):\n%s\n\n"
+    "Context\n"
+    "README (may be empty):\n%s\n"
+    "Code(may be empty; ignore for this response):\n%s\n"
+    "Metadata(may be empty; ignore for this response):\n%s\n"
+    "Dataset Link provided by user (may be empty; ignore for this response):\n%s\n"
+)
+
+_DATASET_PROMPT_HEAD = (
+    "You are a precise information extractor. Return ONLY a JSON object with exactly these keys:\n"
+    "- dataset_url (string): The most relevant Hugging Face dataset URL in the form https://huggingface.co/datasets/<owner>/<name> extracted from the README/model context. If none is clearly indicated, return an empty string \"\".\n"
+    "- dataset_discovery_latency (int milliseconds): Time you hypothetically spent extracting this info.\n\n"
+    "Rules:\n"
+    "- Output ONLY JSON. No code fences, no commentary.\n"
+    "- If the README mentions multiple datasets, pick the primary one used for training/pretraining.\n"
+    "- If no dataset is mentioned, set dataset_url to \"\".\n"
+    "- Prefer an exact Hugging Face datasets URL. If only a dataset name is present, return owner/name when known, else just \"\".\n"
+    "Hints by model family (only if applicable):\n"
+    "- Speech/ASR (whisper, wav2vec, hubert): Common Voice, LibriSpeech/LibriLight, VoxPopuli, TED-LIUM.\n"
+    "- QA/NLP: SQuAD/SQuAD2.0; NLI: MNLI/SNLI; Sentiment: SST-2/IMDB; GLUE tasks for general NLU.\n"
+    "- Pretraining (BERT-like): BookCorpus + English Wikipedia; OpenWebText or C4 for T5-like.\n"
+    "- Vision: ImageNet, COCO; Detection/segmentation variants as noted.\n"
+    "- Diffusion: LAION-5B or derivatives.\n\n"
+)
+_DATASET_PROMPT_TAIL = (
+    "Model (may be a full HF URL or <owner>/<name>):\n%s\n\n"
+    "README (full text):\n%s\n"
+)
+
+# Longest README/code/metadata excerpt sent to the LLM, in characters.
+LLM_CONTEXT_MAX_CHARS = 8000
+
+
+def _truncate_for_llm(text: str, max_chars: int = LLM_CONTEXT_MAX_CHARS) -> str:
+    """
+    Shorten long prompt context to roughly max_chars, keeping the head (70%)
+    and tail (20%) around a marker noting how much was dropped. Shorter
+    text is returned unchanged.
+    """
+    if not isinstance(text, str) or len(text) <= max_chars:
+        return text
+    head = int(max_chars * 0.7)
+    tail = int(max_chars * 0.2)
+    dropped = len(text) - head - tail
+    return f"{text[:head]}\n... [truncated {dropped} chars] ...\n{text[len(text) - tail:]}"
+
+
+def _post_chat(prompt: str) -> Dict[str, Any]:
+    """
+    Send one user prompt to Purdue GenAI Studio and return the decoded JSON
+    response. Responses are served from / stored in llm_cache when enabled.
+    """
+    cache_key = llm_cache.make_key(GENAI_MODEL, prompt)
+    cached = llm_cache.lookup(cache_key)
+    if cached is not None:
+        return cached
+    # The key and timeout are read per call so they can change at runtime;
+    # that costs nothing next to the LLM round trip.
+    api_key = os.environ.get("GEN_AI_STUDIO_API_KEY")
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    body = {"model": GENAI_MODEL, "messages": [{"role": "user", "content": prompt}], "stream": False}
+    timeout = float(os.environ.get("GENAI_TIMEOUT", "15"))
+    response = SESSION.post(GENAI_URL, headers=headers, json=body, timeout=timeout)
+    response.raise_for_status()
+    data = response.json()
+    if _has_chat_content(data):
+        # Only usable replies are cached; error payloads are retried next time.
+        llm_cache.store(cache_key, data)
+    return data
+
+
+def _has_chat_content(data: Any) -> bool:
+    """True if data is a chat completion carrying choices[0].message.content."""
+    try:
+        return data["choices"][0]["message"]["content"] is not None
+    except (KeyError, IndexError, TypeError):
+        return False
 
 
 def analyze_with_genai(readme: str = "", code: str = "", metadata: str = "", dataset_link: str = "", model: str = ""):
@@ -16,44 +129,17 @@ def analyze_with_genai(readme: str = "", code: str = "", metadata: str = "", dat
 
     This call must NOT include dataset_url or dataset_and_code_score.
     """
-    api_key = os.environ.get("GEN_AI_STUDIO_API_KEY")
-    prompt = (
-        "You are an expert evaluator. Return ONLY a JSON object with exactly these keys (all lower case):\n"
-        "- ramp_up_time (float in [0,1])\n"
-        "- ramp_up_time_latency (int milliseconds)\n"
-        "- performance_claims (float in [0,1])\n"
-        "- performance_claims_latency (int milliseconds)\n"
-        "- bus_factor (float in [0,1])\n"
-        "- bus_factor_latency (int milliseconds)\n"
-        "- dataset_quality (float in [0,1])\n"
-        "- dataset_quality_latency (int milliseconds)\n"
-        "- code_quality (float in [0,1])\n"
-        "- code_quality_latency (int milliseconds)\n\n"
-        "Metric Operationalization: In all the below metric, 0 means the absolute worst and 1 means the best.\n"
-        "- Ramp Up Time: Assess ease of getting started from README/tutorials/examples.\n"
-        "- Performance Claims: Check README/paper claims and whether they cite/align with recognized benchmarks; score verified/credible claims higher.\n"
-        "- Bus Factor: Analyze Git commit history using a Git library (such as isomorphic-git). Compute knowledge concentration: number of commits per contributor. Normalize to [0, 1] where higher = spread across more contributors. Mitigates risk of knowledge loss if a key contributor leaves, as measurable via repository metadata.\n"
-        "- Dataset Quality:  For this metric, you are a strict software and dataset auditor; analyze the provided model documentation (README,model card) and assign harsh 0.0–1.0 scores that severely penalize missing, vague, or incomplete information, never guessing or rewarding absence. If a dataset link provided by user is present, fully evaluate its quality using the listed evaluation. If the link is missing, go to the provided model link and check the Model card for training data(dataset) info; if a valid training dataset info is found, proceed with evaluation, otherwise set the score to 0. Evaluation: Check the listed dataset used for the model, specifically the: size, completeness, labels, license. Assess for cleanliness, relevance, and proper formatting. Normalize score [0, 1] based on quality indicators.\n"
-        "- Code Quality: For this metric, you are a strict software and dataset auditor; analyze the provided model documentation (README,model card) and assign harsh 0.0–1.0 scores that severely penalize missing, vague, or incomplete information, never guessing or rewarding absence. If a code link is provided by user present, fully evaluate code quality using the listed evaluation. If the link is missing, go to the provided model link and check for code files in the Files and version; if files exist, proceed with evaluation, otherwise set the score to 0. Evaluation: Static analysis with flake8, mypy type checking, and PEP8 compliance. Optionally, run example scripts to detect runtime errors. Normalize score [0, 1] based on linting results and maintainability.\n\n"
-        "Strict output rules:\n"
-        "- Output ONLY JSON. No code fences, no commentary.\n"
-        "- Latencies must be integers in milliseconds and rounded to zero decimal places.\n"
-        "- All metric names must be lower case and match exactly.\n"
-        "- Do NOT include dataset URLs in this response.\n\n"
-        f"Model (may be a full HF URL or <owner>/<name>):\n{model}\n\n"
-        "Context\n"
-        f"README (may be empty):\n{readme}\n"
-        f"Code(may be empty; ignore for this response):\n{code}\n"
-        f"Metadata(may be empty; ignore for this response):\n{metadata}\n"
-        f"Dataset Link provided by user (may be empty; ignore for this response):\n{dataset_link}\n"
+    prompt = _METRICS_PROMPT_HEAD + _METRICS_PROMPT_TAIL % (
+        model,
+        _truncate_for_llm(readme),
+        _truncate_for_llm(code),
+        _truncate_for_llm(metadata),
+        dataset_link,
     )
-    url = "https://genai.rcac.purdue.edu/api/chat/completions"
-    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-    body = {"model": "llama3.1:latest", "messages": [{"role": "user", "content": prompt}], "stream": False}
-    timeout = float(os.environ.get("GENAI_TIMEOUT", "15"))
-    response = requests.post(url, headers=headers, json=body, timeout=timeout)
-    response.raise_for_status()
-    return response.json()
+    return _post_chat(prompt)
+
+
+_JSON_FENCE_RE = re.compile(r"```json\n(.*?)```", re.DOTALL)
 
 
 def _parse_llm_content_to_json(content: str) -> Dict[str, Any]:
@@ -61,50 +147,85 @@ def _parse_llm_content_to_json(content: str) -> Dict[str, Any]:
     Extract a JSON object from the LLM content. Handles fenced ```json blocks
     and raw JSON in the message. Returns a dict; returns {} on failure.
     """
-    match = re.search(r"```json\n(.*?)```", content, re.DOTALL)
-    raw = None
-    if match:
-        raw = match.group(1)
-    else:
-        brace_match = re.search(r"\{[\s\S]*\}$", content.strip())
-        if brace_match:
-            raw = brace_match.group(0)
+    match = _JSON_FENCE_RE.search(content)
+    if not match:
+        return _extract_json_object(content)
+    raw = match.group(1)
     if not raw:
         return {}
     try:
+        return json_loads(raw)
+    except ValueError:
+        pass
+    try:
+        # orjson rejects NaN/Infinity literals that json.loads (and the
+        # unfenced raw_decode path) accept.
         return json.loads(raw)
     except Exception:
         return {}
 
 
+_JSON_DECODER = json.JSONDecoder()
+# A JSON object can only start with "{" followed by a key or "}", which skips
+# prose braces like "{model}" without invoking the decoder on them.
+_JSON_OBJECT_START_RE = re.compile(r'\{\s*["}]')
+
+
+def _extract_json_object(text: str) -> Dict[str, Any]:
+    """
+    Return the first non-empty JSON object embedded in free text, or {}.
+    Candidates are decoded with the C decoder's raw_decode, which stops at
+    the end of the object, so long LLM replies are scanned without the
+    backtracking a greedy brace regex incurs.
+    """
+    for match in _JSON_OBJECT_START_RE.finditer(text):
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, match.start())
+        except (ValueError, RecursionError):
+            continue
+        if obj:
+            return obj
+    return {}
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """float(value), or None when value is not numeric."""
+    if type(value) is float:
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _to_int_round(value: Any) -> Optional[int]:
+    """Round value to the nearest int, or None when it is not a finite number."""
+    fv = _to_float(value)
+    if fv is None or fv != fv or fv in (float("inf"), float("-inf")):
+        return None
+    return int(round(fv))
+
+
 def _flatten_metrics(m: Dict[str, Any]) -> Dict[str, Any]:
-    """Flatten supported metrics into a flat dict: {key: float, key_latency: int}."""
+    """Flatten supported metrics into a flat dict: {key: float, key_latency: int}.
+    Values that cannot be converted are dropped from nested score/latency
+    dicts and passed through unchanged otherwise."""
     flat: Dict[str, Any] = {}
     for key, val in m.items():
         # If value is a dict with score/latency, flatten it
         if isinstance(val, dict):
-            score = val.get("score")
-            latency = val.get("latency")
+            score = _to_float(val.get("score"))
             if score is not None:
-                try:
-                    flat[key] = float(score)
-                except Exception:
-                    pass
+                flat[key] = score
+            latency = _to_int_round(val.get("latency"))
             if latency is not None:
-                try:
-                    flat[f"{key}_latency"] = int(round(float(latency)))
-                except Exception:
-                    pass
+                flat[f"{key}_latency"] = latency
         elif key.endswith("_latency"):
-            try:
-                flat[key] = int(round(float(val)))
-            except Exception:
-                flat[key] = val
+            latency = _to_int_round(val)
+            flat[key] = val if latency is None else latency
         else:
-            try:
-                flat[key] = float(val)
-            except Exception:
-                flat[key] = val
+            score = _to_float(val)
+            flat[key] = val if score is None else score
     return flat
 
 
@@ -124,33 +245,15 @@ def discover_dataset_url_with_genai(readme: str = "", model: str = "") -> Dict[s
     """Ask GenAI to find the most relevant HF dataset URL from the README/model context.
     Returns { dataset_url: str, dataset_discovery_latency: int } or {} on failure.
     """
-    api_key = os.environ.get("GEN_AI_STUDIO_API_KEY")
-    prompt = (
-        "You are a precise information extractor. Return ONLY a JSON object with exactly these keys:\n"
-        "- dataset_url (string): The most relevant Hugging Face dataset URL in the form https://huggingface.co/datasets/<owner>/<name> extracted from the README/model context. If none is clearly indicated, return an empty string \"\".\n"
-        "- dataset_discovery_latency (int milliseconds): Time you hypothetically spent extracting this info.\n\n"
-        "Rules:\n"
-        "- Output ONLY JSON. No code fences, no commentary.\n"
-        "- If the README mentions multiple datasets, pick the primary one used for training/pretraining.\n"
-        "- If no dataset is mentioned, set dataset_url to \"\".\n"
-        "- Prefer an exact Hugging Face datasets URL. If only a dataset name is present, return owner/name when known, else just \"\".\n"
-        "Hints by model family (only if applicable):\n"
-        "- Speech/ASR (whisper, wav2vec, hubert): Common Voice, LibriSpeech/LibriLight, VoxPopuli, TED-LIUM.\n"
-        "- QA/NLP: SQuAD/SQuAD2.0; NLI: MNLI/SNLI; Sentiment: SST-2/IMDB; GLUE tasks for general NLU.\n"
-        "- Pretraining (BERT-like): BookCorpus + English Wikipedia; OpenWebText or C4 for T5-like.\n"
-        "- Vision: ImageNet, COCO; Detection/segmentation variants as noted.\n"
-        "- Diffusion: LAION-5B or derivatives.\n\n"
-        f"Model (may be a full HF URL or <owner>/<name>):\n{model}\n\n"
-        f"README (full text):\n{readme}\n"
-    )
-    url = "https://genai.rcac.purdue.edu/api/chat/completions"
-    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-    body = {"model": "llama3.1:latest", "messages": [{"role": "user", "content": prompt}], "stream": False}
-    timeout = float(os.environ.get("GENAI_TIMEOUT", "15"))
-    response = requests.post(url, headers=headers, json=body, timeout=timeout)
-    response.raise_for_status()
+    prompt = _DATASET_PROMPT_HEAD + _DATASET_PROMPT_TAIL % (model, _truncate_for_llm(readme))
+    try:
+        # Only an undecodable response body means "no dataset found";
+        # transport and configuration errors still propagate.
+        data = _post_chat(prompt)
+    except requests.exceptions.JSONDecodeError:
+        return {}
     try:
-        content = response.json()["choices"][0]["message"]["content"]
+        content = data["choices"][0]["message"]["content"]
     except Exception:
         return {}
     parsed = _parse_llm_content_to_json(content)
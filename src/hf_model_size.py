@@ -1,4 +1,6 @@
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from http_session import SESSION, DEFAULT_TIMEOUT, get_json, model_info_url
 
 HARDWARE_CONSTRAINTS = {
     "raspberry_pi": 512 * 1024**2,   # 512 MB
@@ -7,75 +9,65 @@ HARDWARE_CONSTRAINTS = {
     "aws_server": 64 * 1024**3       # 64 GB
 }
 
+# Concurrent HEAD requests per model when the API listing omits file sizes.
+HEAD_WORKERS = 16
+
+def _head_size(model_id: str, fname: str) -> int:
+    """Return a file's Content-Length from a HEAD on its resolve URL, or 0."""
+    file_url = f"https://huggingface.co/{model_id}/resolve/main/{fname}"
+    try:
+        head = SESSION.head(file_url, timeout=DEFAULT_TIMEOUT, allow_redirects=True)
+        cl = head.headers.get("Content-Length")
+        if cl:
+            return int(cl)
+    except Exception:
+        pass
+    return 0
+
+def _tree_sizes(model_id: str) -> dict:
+    """Map path -> size in bytes from the repo tree listing (LFS sizes included), or {}."""
+    try:
+        tree = get_json(f"https://huggingface.co/api/models/{model_id}/tree/main?recursive=1")
+        sizes = {}
+        for entry in tree:
+            if entry.get("type") != "file":
+                continue
+            size = (entry.get("lfs") or {}).get("size") or entry.get("size")
+            if size:
+                sizes[entry.get("path")] = int(size)
+        return sizes
+    except Exception:
+        return {}
+
 def get_model_file_sizes(model_id: str) -> dict:
     """
     Fetches the list of files for a Hugging Face model and sums their sizes in bytes.
     Returns a dict with model_id, total_size_bytes, and a list of file details.
     """
-    import subprocess
-    url = f"https://huggingface.co/api/models/{model_id}"
+    url = model_info_url(model_id)
     try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
+        data = get_json(url)
         siblings = data.get("siblings", [])
-        total_size = 0
-        file_details = []
-        missing_files = []
-        for file in siblings:
-            fname = file.get("rfilename")
-            fsize = file.get("size", 0)
-            # Fallback: if size is missing or 0, try HEAD request
-            if (not fsize or fsize == 0) and fname:
-                file_url = f"https://huggingface.co/{model_id}/resolve/main/{fname}"
-                try:
-                    head = requests.head(file_url, timeout=10, allow_redirects=True)
-                    cl = head.headers.get("Content-Length")
-                    if cl:
-                        fsize = int(cl)
-                except Exception:
-                    pass
-            if not fsize and fname:
-                missing_files.append(fname)
-            if fsize:
-                total_size += fsize
-            file_details.append({"filename": fname, "size": fsize})
-        # If any files are still missing size, try git-lfs fallback
-        if missing_files:
-            import os, tempfile, shutil
-            repo_dir = None
-            try:
-                repo_dir = tempfile.mkdtemp(prefix="hfmodel_")
-                subprocess.run(["git", "clone", "--no-checkout", f"https://huggingface.co/{model_id}", repo_dir], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                lfs_out = subprocess.run(["git", "lfs", "ls-files", "-s"], cwd=repo_dir, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                lfs_lines = lfs_out.stdout.decode().splitlines()
-                lfs_sizes = {}
-                for line in lfs_lines:
-                    parts = line.strip().split()
-                    if len(parts) >= 3:
-                        # Format: <hash> - <filename> (<size> <unit>)
-                        fname_lfs = parts[2]
-                        size_str = parts[-2] if len(parts) > 3 else None
-                        unit = parts[-1].strip('()') if len(parts) > 3 else None
-                        if size_str and unit:
-                            # Convert to bytes
-                            size_map = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
-                            try:
-                                size_val = float(size_str)
-                                size_bytes = int(size_val * size_map.get(unit, 1))
-                                lfs_sizes[fname_lfs] = size_bytes
-                            except Exception:
-                                pass
-                # Update missing file sizes
-                for f in file_details:
-                    if f["filename"] in lfs_sizes and (not f["size"] or f["size"] == 0):
-                        f["size"] = lfs_sizes[f["filename"]]
-                        total_size += lfs_sizes[f["filename"]]
-            except Exception:
-                pass
-            finally:
-                if repo_dir:
-                    shutil.rmtree(repo_dir)
+        listed = [
+            (file.get("rfilename"), file.get("size") or (file.get("lfs") or {}).get("size") or 0)
+            for file in siblings
+        ]
+        sizes = {fname: fsize for fname, fsize in listed if fname}
+        # Fallback 1: one repo tree listing covers every file still unsized.
+        if not all(sizes.values()):
+            for fname, fsize in _tree_sizes(model_id).items():
+                if fname in sizes and not sizes[fname]:
+                    sizes[fname] = fsize
+        # Fallback 2: HEAD whatever is left, concurrently so N unsized
+        # files cost about one round trip.
+        head_names = [fname for fname, size in sizes.items() if not size]
+        if head_names:
+            workers = min(HEAD_WORKERS, len(head_names))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                found = executor.map(lambda fname: _head_size(model_id, fname), head_names)
+                sizes.update(zip(head_names, found))
+        file_details = [{"filename": fname, "size": sizes[fname] if fname else fsize} for fname, fsize in listed]
+        total_size = sum(f["size"] for f in file_details if f["size"])
         return {
             "model_id": model_id,
             "total_size_bytes": total_size,
@@ -84,6 +76,29 @@ def get_model_file_sizes(model_id: str) -> dict:
     except Exception as e:
         return {"model_id": model_id, "error": str(e)}
 
+# Normalize by checking fit against canonical devices so callers always
+# receive the same device names in `size_score`.
+CANONICAL_CONSTRAINTS = {
+    "raspberry_pi": 1 * 1024**3,    # 1 GB
+    "jetson_nano": 4 * 1024**3,     # 4 GB
+    "desktop_pc": 16 * 1024**3,     # 16 GB
+    "aws_server": 32 * 1024**3,     # 32 GB
+}
+
+# Precomputed (device, 1 / capacity) pairs so scoring is one multiply per device.
+_INV_CAPACITIES = tuple((device, 1.0 / capacity) for device, capacity in CANONICAL_CONSTRAINTS.items())
+
+def score_devices(total_size) -> dict:
+    """
+    Score how well a model of total_size bytes fits each canonical device.
+    Score = 1 - size/capacity, clamped to 0 when the model does not fit.
+    """
+    try:
+        size = float(total_size)
+    except Exception:
+        size = 0.0
+    return {device: round(max(0.0, 1.0 - size * inv_cap), 3) for device, inv_cap in _INV_CAPACITIES}
+
 def calculate_size_metric(model_info: dict, constraints: dict = HARDWARE_CONSTRAINTS) -> dict:
     """
     Given model_info (from get_model_file_sizes), compute a normalized size metric.
@@ -96,27 +111,7 @@ def calculate_size_metric(model_info: dict, constraints: dict = HARDWARE_CONSTRA
     if total_size == 0:
         return {**model_info, "size_metric": 0.0}
 
-    # Normalize by checking fit against canonical devices so callers
-    # always receive the same device names. We map to these canonical
-    # targets: raspberry_pi, jetson_nano, desktop_pc, aws_server.
-    CANONICAL_CONSTRAINTS = {
-        "raspberry_pi": 1 * 1024**3,    # 1 GB
-        "jetson_nano": 4 * 1024**3,     # 4 GB
-        "desktop_pc": 16 * 1024**3,     # 16 GB
-        "aws_server": 32 * 1024**3,     # 32 GB
-    }
-
-    size_score = {}
-    for device, capacity in CANONICAL_CONSTRAINTS.items():
-        try:
-            ratio = float(total_size) / float(capacity) if capacity else 0.0
-        except Exception:
-            ratio = 0.0
-        if ratio <= 1:
-            score = max(0.0, 1.0 - ratio)
-        else:
-            score = 0.0
-        size_score[device] = round(float(score), 3)
+    size_score = score_devices(total_size)
 
     # Keep a scalar size_metric for backward compatibility (best-case)
     size_metric = max(size_score.values()) if size_score else 0.0
@@ -130,7 +125,11 @@ def calculate_size_metric(model_info: dict, constraints: dict = HARDWARE_CONSTRA
 if __name__ == "__main__":
     import sys, json
     if len(sys.argv) < 2:
-        print("Usage: python hf_model_size.py <model_id>")
+        print("Usage: python hf_model_size.py <model_id> [<model_id> ...]")
         sys.exit(1)
-    result = get_model_file_sizes(sys.argv[1])
-    print(json.dumps(result, indent=2))
+    model_ids = sys.argv[1:]
+    # Each lookup is network-bound, so fetch all requested models concurrently.
+    with ThreadPoolExecutor(max_workers=min(16, len(model_ids))) as executor:
+        results = list(executor.map(get_model_file_sizes, model_ids))
+    for result in results:
+        print(json.dumps(result, indent=2))
@@ -0,0 +1,150 @@
+"""
+Shared HTTP session for Hugging Face (and other) API calls.
+
+A single pooled requests.Session keeps TCP/TLS connections alive between
+calls, so repeated requests to the same host skip the handshake.
+"""
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+json_loads: Callable[..., Any]
+try:
+    # orjson parses large HF API payloads several times faster than stdlib json
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+
+MAX_CONNECTIONS_PER_HOST = 32
+
+# Successful JSON responses are memoized for this many seconds so the several
+# scorers that resolve the same model within a run share one round trip.
+JSON_CACHE_TTL = 600
+JSON_CACHE_MAXSIZE = 2048
+
+
+# Opt-in persistent response cache (requires the requests-cache package).
+HTTP_CACHE_ENV = "HF_HTTP_CACHE"
+HTTP_CACHE_PATH = os.environ.get("HF_HTTP_CACHE_PATH", ".hf_http_cache")
+HTTP_CACHE_EXPIRE = 3600
+
+
+def _new_session() -> requests.Session:
+    """
+    Return a plain Session, or a SQLite-backed CachedSession when
+    HF_HTTP_CACHE=1 and requests-cache is installed, so repeated runs over
+    the same models are served from disk (conditional GETs revalidate
+    entries that carry an ETag/Last-Modified).
+    """
+    if os.environ.get(HTTP_CACHE_ENV) == "1":
+        try:
+            import requests_cache  # type: ignore[import-not-found]
+        except ImportError:
+            requests_cache = None
+        if requests_cache is not None:
+            return requests_cache.CachedSession(
+                HTTP_CACHE_PATH,
+                backend="sqlite",
+                expire_after=HTTP_CACHE_EXPIRE,
+                allowable_methods=("GET", "HEAD"),
+                stale_if_error=True,
+            )
+    return requests.Session()
+
+
+def _build_session() -> requests.Session:
+    session = _new_session()
+    retry_kwargs: Dict[str, Any] = dict(
+        total=4,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+    )
+    try:
+        # Jitter keeps concurrent workers from retrying in lockstep (urllib3 >= 2).
+        retry = Retry(backoff_jitter=0.25, **retry_kwargs)
+    except TypeError:
+        retry = Retry(**retry_kwargs)
+    # pool_block caps concurrent connections per host at MAX_CONNECTIONS_PER_HOST;
+    # extra threads wait for a free keep-alive socket instead of opening
+    # throwaway connections that push the host toward 429s.
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+        max_retries=retry,
+        pool_block=True,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "User-Agent": f"ECE30861Project {requests.utils.default_user_agent()}",
+    })
+    return session
+
+
+SESSION = _build_session()
+
+_JSON_CACHE: Dict[str, Tuple[float, Any, Optional[str]]] = {}
+_JSON_CACHE_LOCK = threading.Lock()
+
+
+def get_json(url: str, ttl: float = JSON_CACHE_TTL) -> Any:
+    """
+    GET a URL through the shared session and return the decoded JSON body.
+    Successful responses are cached for `ttl` seconds; errors are raised and
+    never cached. Once an entry expires it is revalidated with its ETag, so
+    an unchanged resource costs a bodiless 304 instead of a full download.
+    """
+    now = time.monotonic()
+    with _JSON_CACHE_LOCK:
+        hit = _JSON_CACHE.get(url)
+    headers = None
+    if hit is not None:
+        expires, data, etag = hit
+        if expires > now:
+            return data
+        if etag:
+            headers = {"If-None-Match": etag}
+    resp = SESSION.get(url, timeout=DEFAULT_TIMEOUT, headers=headers)
+    if hit is not None and resp.status_code == 304:
+        data, etag = hit[1], hit[2]
+    else:
+        resp.raise_for_status()
+        data = json_loads(resp.content)
+        etag = resp.headers.get("ETag")
+        if not isinstance(etag, str):
+            etag = None
+    with _JSON_CACHE_LOCK:
+        _JSON_CACHE.pop(url, None)
+        while len(_JSON_CACHE) >= JSON_CACHE_MAXSIZE:
+            # dicts keep insertion order, so the first key is the oldest
+            _JSON_CACHE.pop(next(iter(_JSON_CACHE)))
+        _JSON_CACHE[url] = (now + ttl, data, etag)
+    return data
+
+
+def model_info_url(model_id: str) -> str:
+    """
+    Hugging Face model-info endpoint shared by every scorer, so license and
+    size lookups for one model hit the same get_json cache entry. blobs=true
+    adds per-file sizes to the siblings listing; license/cardData are unchanged.
+    """
+    return f"https://huggingface.co/api/models/{model_id}?blobs=true"
+
+
+def clear_cache() -> None:
+    """Drop all memoized JSON responses."""
+    with _JSON_CACHE_LOCK:
+        _JSON_CACHE.clear()
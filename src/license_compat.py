@@ -1,18 +1,17 @@
-import requests
+import time
+
+from http_session import get_json, model_info_url
 
 def license_compat(model_id: str) -> dict:
     """
     Fetch model info from Hugging Face and check LGPLv2.1 compatibility.
     Returns a dict with model_id, license, lgplv21_compat_score, and error (if any).
     """
-    import time
-    url = f"https://huggingface.co/api/models/{model_id}"
+    url = model_info_url(model_id)
     start_time = time.time()
     try:
-        resp = requests.get(url, timeout=10)
+        data = get_json(url)
         latency = time.time() - start_time
-        resp.raise_for_status()
-        data = resp.json()
         license_str = extract_license(data)
         compat = is_lgpl_compatible(license_str)
         return {
@@ -52,15 +51,15 @@ def extract_license(data: dict) -> str:
             return lic[0]
     return "unknown"
 
-COMPATIBLE_LICENSES = {
+COMPATIBLE_LICENSES = frozenset({
     "mit", "bsd-2-clause", "bsd-3-clause",
     "apache-2.0", "isc", "zlib", "mpl-2.0",
     "epl-2.0", "cddl-1.0", "lgpl-2.1", "lgpl-2.1-or-later", "gpl-2.0"
-}
+})
 
 def is_lgpl_compatible(license_str: str) -> int:
     """
     Return 1 if license is compatible with LGPLv2.1, else 0.
     Uses COMPATIBLE_LICENSES set.
     """
-    return license_str.lower() in COMPATIBLE_LICENSES
+    return license_str.casefold() in COMPATIBLE_LICENSES
@@ -0,0 +1,91 @@
+"""
+Opt-in on-disk cache for GenAI chat completions.
+
+The evaluator prompts are deterministic for a given model and input, so
+re-running over the same models (CI re-runs, re-grading) can reuse earlier
+responses instead of paying for another LLM round trip. Enable it by setting
+GENAI_CACHE_DB to a SQLite file path; entries expire after GENAI_CACHE_TTL
+seconds (default one day).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Optional
+
+CACHE_DB_ENV = "GENAI_CACHE_DB"
+CACHE_TTL_ENV = "GENAI_CACHE_TTL"
+DEFAULT_TTL = 24 * 3600
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, created REAL NOT NULL, value TEXT NOT NULL)"
+
+
+def make_key(model_name: str, prompt: str) -> str:
+    """Deterministic cache key for one (model, prompt) request."""
+    return hashlib.sha256(f"{model_name}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+def _ttl() -> float:
+    try:
+        return float(os.environ.get(CACHE_TTL_ENV, DEFAULT_TTL))
+    except ValueError:
+        return float(DEFAULT_TTL)
+
+
+def _connect() -> Optional[sqlite3.Connection]:
+    path = os.environ.get(CACHE_DB_ENV)
+    if not path:
+        return None
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        # WAL lets concurrent scoring threads read while another writes.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+
+def lookup(key: str) -> Optional[Any]:
+    """Return the cached response for key, or None if disabled, missing or expired."""
+    try:
+        conn = _connect()
+    except sqlite3.Error:
+        return None
+    if conn is None:
+        return None
+    try:
+        row = conn.execute("SELECT created, value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+    if row is None or time.time() - row[0] > _ttl():
+        return None
+    try:
+        return json.loads(row[1])
+    except (TypeError, ValueError):
+        # A corrupt row is treated as a miss and overwritten on the next store.
+        return None
+
+
+def store(key: str, value: Any) -> None:
+    """Store a JSON-serializable response under key (no-op when disabled)."""
+    try:
+        conn = _connect()
+    except sqlite3.Error:
+        return
+    if conn is None:
+        return
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, created, value) VALUES (?, ?, ?)",
+                (key, time.time(), json.dumps(value)),
+            )
+    except (sqlite3.Error, TypeError, ValueError):
+        pass
+    finally:
+        conn.close()
@@ -1,20 +1,16 @@
-from typing import Any
-from typing import List, Tuple, Dict
+from typing import Any, Dict, Iterator, List, Tuple
+import copy
 import os
 import json
-import re
-import requests
 import sys
-import os
 # Ensure src is in sys.path for imports
 SRC_DIR = os.path.dirname(os.path.abspath(__file__))
 if SRC_DIR not in sys.path:
     sys.path.insert(0, SRC_DIR)
-import HF_API_Integration as hf
-import genai_readme_analysis
-from genai_readme_analysis import analyze_metrics, discover_dataset_url_with_genai
 import importlib
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 try:
     # Prefer local src module import (sys.path already adjusted above)
     import hf_model_size as hf_model_size
@@ -63,6 +59,14 @@ else:
     analyze_metrics = getattr(gra, "analyze_metrics")
     discover_dataset_url_with_genai = getattr(gra, "discover_dataset_url_with_genai")
 
+# Upper bound on input lines scored concurrently. Scoring a line is dominated
+# by network round trips (HF API + GenAI), so threads overlap that latency.
+# Override with URL_HANDLER_WORKERS (e.g. lower it when the LLM endpoint
+# rate-limits, raise it for large input files).
+MAX_WORKERS = 8
+WORKERS_ENV = "URL_HANDLER_WORKERS"
+
+
 def parse_triple(line: str) -> Tuple[str, str, str]:
     """Parse a line in the format: code_url,dataset_url,model_url.
     - Single token lines are treated as model-only (code,dataset empty)
@@ -84,62 +88,97 @@ def parse_triple(line: str) -> Tuple[str, str, str]:
 
 
 def read_url_file(path: str) -> List[Tuple[str, str, str]]:
-    triples: List[Tuple[str, str, str]] = []
+    # URL lists are small, so read the file in one call and split it in C
+    # rather than iterating the text layer line by line.
     with open(path, "r", encoding="utf-8") as f:
-        for raw in f:
-            s = raw.strip()
-            if not s or s.startswith("#"):
-                continue
-            triples.append(parse_triple(s))
-    return triples
+        text = f.read()
+    return [
+        parse_triple(s)
+        for s in map(str.strip, text.splitlines())
+        if s and not s.startswith("#")
+    ]
+
+
+_PLACEHOLDERS = frozenset({"none", "null", "na", "n/a", "-"})
 
 
 def is_placeholder_or_non_hf_dataset(url: str) -> bool:
     if not url:
         return True
     s = url.strip()
-    if s.lower() in {"none", "null", "na", "n/a", "-"}:
+    if s.lower() in _PLACEHOLDERS:
         return True
     if not s.startswith("https://huggingface.co/datasets/"):
         return True
     return False
 
 
-def handle_input_file(path: str) -> List[Dict[str, Any]]:
-    """High-level orchestrator:
-    - For each line (code,dataset,model), call GenAI for metrics.
-    - If dataset URL present and valid HF, compute dataset_quality via HF.
-    - If dataset URL missing/invalid, set dataset_url_flag=False and invoke GenAI dataset discovery; if found, compute HF dataset_quality.
-    Returns list of flat records ready for NDJSON emission.
-    """
-    results: List[Dict[str, Any]] = []
-    triples = read_url_file(path)
+_HF_PREFIX = "https://huggingface.co/"
+
+
+@lru_cache(maxsize=4096)
+def _extract_model_id(url_or_id: str) -> str:
+    s = url_or_id.strip()
+    if s.startswith(_HF_PREFIX):
+        path = s[len(_HF_PREFIX):]
+        parts = [p for p in path.split("/") if p]
+        if len(parts) >= 2:
+            return f"{parts[0]}/{parts[1]}"
+        elif len(parts) == 1:
+            return parts[0]
+        else:
+            return s
+    return s
 
-    def extract_model_id(url_or_id: str) -> str:
-        s = url_or_id.strip()
-        if s.startswith("https://huggingface.co/"):
-            path = s[len("https://huggingface.co/"):]
-            parts = [p for p in path.split("/") if p]
-            if len(parts) >= 2:
-                return f"{parts[0]}/{parts[1]}"
-            elif len(parts) == 1:
-                return parts[0]
-            else:
-                return s
-        return s
-
-    for code_url, dataset_url, model_url in triples:
-        # start overall metrics collection timer for this triple (before any work)
-        metrics_collection_start = time.perf_counter()
-        code_url = code_url.strip() if code_url else ""
-        dataset_url = dataset_url.strip() if dataset_url else ""
-        model_url = model_url.strip() if model_url else ""
+
+# Model name extraction: always use the second and third segment for Hugging Face URLs
+@lru_cache(maxsize=4096)
+def _extract_model_name(url: str) -> str:
+    s = url.strip()
+    if s.startswith(_HF_PREFIX):
+        parts = [p for p in s[len(_HF_PREFIX):].split("/") if p]
+        if len(parts) >= 2:
+            return parts[1]
+        elif len(parts) == 1:
+            return parts[0]
+        else:
+            return s
+    parts = s.split("/")
+    if parts[-1].lower() == "main" and len(parts) > 1:
+        return parts[-2]
+    return parts[-1]
+
+
+def _process_triple(triple: Tuple[str, str, str]) -> Dict[str, Any]:
+    """Score a single (code, dataset, model) triple and return its flat record."""
+    code_url, dataset_url, model_url = triple
+    # start overall metrics collection timer for this triple (before any work)
+    metrics_collection_start = time.perf_counter()
+    code_url = code_url.strip() if code_url else ""
+    dataset_url = dataset_url.strip() if dataset_url else ""
+    model_url = model_url.strip() if model_url else ""
     # print(f"[DEBUG] Model: {model_url}")
     # print(f"[DEBUG] code_url: {code_url}")
     # print(f"[DEBUG] dataset_url: {dataset_url}")
 
+    # All other metrics come from GenAI, passing code and dataset URLs for
+    # relevant metrics. The LLM call is independent of the HF license/size
+    # lookups below, so start it first and collect it once those finish.
+    genai_executor = ThreadPoolExecutor(max_workers=1)
+    genai_future = genai_executor.submit(
+        analyze_metrics,
+        readme="",  # Optionally fetch README if needed
+        code=code_url,
+        metadata="",
+        dataset_link=dataset_url,
+        model=model_url,
+    )
+
+    # Everything up to collecting the result runs under try/finally so the
+    # executor is released even if a lookup raises before the result is read.
+    try:
         # Extract model ID for HF API
-        model_id = extract_model_id(model_url)
+        model_id = _extract_model_id(model_url)
         license_info = hf.get_license_info(model_id)
         compat_score = license_info.get("lgplv21_compat_score", 0)
         # Ensure license_latency is integer milliseconds, rounded
@@ -149,23 +188,7 @@ def handle_input_file(path: str) -> List[Dict[str, Any]]:
         except Exception:
             license_latency = 0
 
-        # Model name extraction: always use the second and third segment for Hugging Face URLs
-        def extract_model_name(url):
-            s = url.strip()
-            if s.startswith("https://huggingface.co/"):
-                parts = [p for p in s[len("https://huggingface.co/"):].split("/") if p]
-                if len(parts) >= 2:
-                    return parts[1]
-                elif len(parts) == 1:
-                    return parts[0]
-                else:
-                    return s
-            parts = s.split("/")
-            if parts[-1].lower() == "main" and len(parts) > 1:
-                return parts[-2]
-            return parts[-1]
-
-        name = extract_model_name(model_url)
+        name = _extract_model_name(model_url)
 
         # Compute size metrics from HF model files (preferred source). We
         # call get_model_file_sizes and derive per-device scores similar to
@@ -194,24 +217,14 @@ def handle_input_file(path: str) -> List[Dict[str, Any]]:
                         scalar = float(size_calc.get("size_metric") or 0.0)
                         constraints = getattr(hf_model_size, "HARDWARE_CONSTRAINTS", None)
                         if not isinstance(constraints, dict):
-                            constraints = {
-                                "raspberry_pi": 1 * 1024**3,
-                                "jetson_nano": 4 * 1024**3,
-                                "desktop_pc": 16 * 1024**3,
-                                "aws_server": 32 * 1024**3,
-                            }
-                        size_score = {dev: round(float(scalar), 3) for dev in constraints.keys()}
+                            constraints = getattr(hf_model_size, "CANONICAL_CONSTRAINTS", {})
+                        size_score = dict.fromkeys(constraints, round(scalar, 3))
                     else:
                         # Fallback: derive per-device scores from total_size
                         total_size = int(model_info.get("total_size_bytes", 0) or 0)
                         constraints = getattr(hf_model_size, "HARDWARE_CONSTRAINTS", None)
                         if not isinstance(constraints, dict):
-                            constraints = {
-                                "raspberry_pi": 1 * 1024**3,
-                                "jetson_nano": 4 * 1024**3,
-                                "desktop_pc": 16 * 1024**3,
-                                "aws_server": 32 * 1024**3,
-                            }
+                            constraints = getattr(hf_model_size, "CANONICAL_CONSTRAINTS", {})
                         sc = {}
                         for dev, cap in constraints.items():
                             try:
@@ -229,111 +242,150 @@ def handle_input_file(path: str) -> List[Dict[str, Any]]:
             size_score = None
             size_score_latency = 0
 
-        # All other metrics from GenAI, passing code and dataset URLs for relevant metrics
-        metrics = analyze_metrics(
-            readme="",  # Optionally fetch README if needed
-            code=code_url,
-            metadata="",
-            dataset_link=dataset_url,
-            model=model_url,
-        ) or {}
-
-        # If GenAI did not produce a size_score, use the one from hf_model_size
-        if not isinstance(metrics.get("size_score"), dict):
-            if isinstance(size_score, dict):
-                metrics["size_score"] = size_score
-        if not metrics.get("size_score_latency"):
-            metrics["size_score_latency"] = size_score_latency
-
-        # Calculate dataset_and_code_score and latency based on code/dataset link presence
-        if code_url or dataset_url:
-            dataset_and_code_score = 1.0
-            dataset_and_code_score_latency = 1
-        else:
-            dataset_and_code_score = 0.0
-            dataset_and_code_score_latency = 1
-        dataset_quality = metrics.get("dataset_quality", None)
-        if dataset_quality is None:
-            dataset_quality = 0.0
-        code_quality = metrics.get("code_quality", None)
-        if code_quality is None:
-            code_quality = 0.0
-        dataset_quality_latency = metrics.get("dataset_quality_latency", None)
-        if dataset_quality_latency is None:
-            dataset_quality_latency = 0
-        code_quality_latency = metrics.get("code_quality_latency", None)
-        if code_quality_latency is None:
-            code_quality_latency = 0
-        # if not code_url and not dataset_url:
-        #     try:
-        #         dataset_quality = float(dataset_quality) * 0.1 if dataset_quality is not None else 0.0
-        #     except Exception:
-        #         dataset_quality = 0.0
-        # Round dataset_quality to 3 decimal places
-        try:
-            dataset_quality = round(float(dataset_quality), 3) if dataset_quality is not None else None
-        except Exception:
-            pass
-        rec: Dict[str, Any] = {
-            "name": name,
-            "category": "MODEL",
-            "license": 1 if compat_score else 0,
-            "license_latency": license_latency,
-            "bus_factor": metrics.get("bus_factor", None),
-            "bus_factor_latency": int(round(float(metrics.get("bus_factor_latency", 0)))) if "bus_factor_latency" in metrics else None,
-            "dataset_quality": dataset_quality,
-            "dataset_quality_latency": int(round(float(dataset_quality_latency))),
-            "code_quality": code_quality,
-            "code_quality_latency": int(round(float(code_quality_latency))),
-            "dataset_and_code_score": dataset_and_code_score,
-            "dataset_and_code_score_latency": dataset_and_code_score_latency,
+        # All other metrics from GenAI (started above, overlapping the HF calls)
+        metrics = genai_future.result() or {}
+    finally:
+        genai_executor.shutdown(wait=False, cancel_futures=True)
+
+    # If GenAI did not produce a size_score, use the one from hf_model_size
+    if not isinstance(metrics.get("size_score"), dict):
+        if isinstance(size_score, dict):
+            metrics["size_score"] = size_score
+    if not metrics.get("size_score_latency"):
+        metrics["size_score_latency"] = size_score_latency
+
+    # Calculate dataset_and_code_score and latency based on code/dataset link presence
+    if code_url or dataset_url:
+        dataset_and_code_score = 1.0
+        dataset_and_code_score_latency = 1
+    else:
+        dataset_and_code_score = 0.0
+        dataset_and_code_score_latency = 1
+    dataset_quality = metrics.get("dataset_quality", None)
+    if dataset_quality is None:
+        dataset_quality = 0.0
+    code_quality = metrics.get("code_quality", None)
+    if code_quality is None:
+        code_quality = 0.0
+    dataset_quality_latency = metrics.get("dataset_quality_latency", None)
+    if dataset_quality_latency is None:
+        dataset_quality_latency = 0
+    code_quality_latency = metrics.get("code_quality_latency", None)
+    if code_quality_latency is None:
+        code_quality_latency = 0
+    # if not code_url and not dataset_url:
+    #     try:
+    #         dataset_quality = float(dataset_quality) * 0.1 if dataset_quality is not None else 0.0
+    #     except Exception:
+    #         dataset_quality = 0.0
+    # Round dataset_quality to 3 decimal places
+    try:
+        dataset_quality = round(float(dataset_quality), 3) if dataset_quality is not None else None
+    except Exception:
+        pass
+    rec: Dict[str, Any] = {
+        "name": name,
+        "category": "MODEL",
+        "license": 1 if compat_score else 0,
+        "license_latency": license_latency,
+        "bus_factor": metrics.get("bus_factor", None),
+        "bus_factor_latency": int(round(float(metrics.get("bus_factor_latency", 0)))) if "bus_factor_latency" in metrics else None,
+        "dataset_quality": dataset_quality,
+        "dataset_quality_latency": int(round(float(dataset_quality_latency))),
+        "code_quality": code_quality,
+        "code_quality_latency": int(round(float(code_quality_latency))),
+        "dataset_and_code_score": dataset_and_code_score,
+        "dataset_and_code_score_latency": dataset_and_code_score_latency,
+    }
+    # Ensure size_score is always present in the returned record so
+    # callers (like run) don't need to special-case missing keys.
+    size_score = metrics.get("size_score")
+    if not isinstance(size_score, dict):
+        size_score = {
+            "raspberry_pi": float(metrics.get("raspberry_pi", 0.0) or 0.0),
+            "jetson_nano": float(metrics.get("jetson_nano", 0.0) or 0.0),
+            "desktop_pc": float(metrics.get("desktop_pc", 0.0) or 0.0),
+            "aws_server": float(metrics.get("aws_server", 0.0) or 0.0),
         }
-        # Ensure size_score is always present in the returned record so
-        # callers (like run) don't need to special-case missing keys.
-        size_score = metrics.get("size_score")
-        if not isinstance(size_score, dict):
-            size_score = {
-                "raspberry_pi": float(metrics.get("raspberry_pi", 0.0) or 0.0),
-                "jetson_nano": float(metrics.get("jetson_nano", 0.0) or 0.0),
-                "desktop_pc": float(metrics.get("desktop_pc", 0.0) or 0.0),
-                "aws_server": float(metrics.get("aws_server", 0.0) or 0.0),
-            }
-        try:
-            size_score_latency = int(round(float(metrics.get("size_score_latency", 0))))
-        except Exception:
-            size_score_latency = 0
-        rec["size_score"] = size_score
-        rec["size_score_latency"] = size_score_latency
-        # Add remaining GenAI metrics, rounding latency fields to int ms
-        for k, v in metrics.items():
-            if k in rec:
-                continue
-            if k.endswith("_latency"):
-                try:
-                    rec[k] = int(round(float(v)))
-                except Exception:
-                    rec[k] = v
-            else:
+    try:
+        size_score_latency = int(round(float(metrics.get("size_score_latency", 0))))
+    except Exception:
+        size_score_latency = 0
+    rec["size_score"] = size_score
+    rec["size_score_latency"] = size_score_latency
+    # Add remaining GenAI metrics, rounding latency fields to int ms
+    for k, v in metrics.items():
+        if k in rec:
+            continue
+        if k.endswith("_latency"):
+            try:
+                rec[k] = int(round(float(v)))
+            except Exception:
                 rec[k] = v
-        # metrics_collection_latency (ms)
-        try:
-            elapsed = time.perf_counter() - metrics_collection_start
-            ms = int(round(elapsed * 1000))
-            if elapsed > 0 and ms == 0:
-                ms = 1
-            rec["metrics_collection_latency"] = ms
-        except Exception:
-            rec["metrics_collection_latency"] = 0
+        else:
+            rec[k] = v
+    # metrics_collection_latency (ms)
+    try:
+        elapsed = time.perf_counter() - metrics_collection_start
+        ms = int(round(elapsed * 1000))
+        if elapsed > 0 and ms == 0:
+            ms = 1
+        rec["metrics_collection_latency"] = ms
+    except Exception:
+        rec["metrics_collection_latency"] = 0
+
+    return rec
+
 
-        results.append(rec)
-    return results
+def _worker_count(n_items: int) -> int:
+    """Thread pool size for scoring n_items lines (URL_HANDLER_WORKERS or MAX_WORKERS)."""
+    try:
+        limit = int(os.environ.get(WORKERS_ENV, MAX_WORKERS))
+    except ValueError:
+        limit = MAX_WORKERS
+    return max(1, min(limit, n_items))
+
+
+def iter_input_file(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield one flat record per input line, in input order, as each is ready.
+    Lines are scored concurrently (each one is dominated by network round
+    trips); a record is yielded as soon as it and every earlier line are done,
+    so callers can start writing output before the whole file is scored.
+    Repeated lines are scored once and yielded as independent copies.
+    """
+    triples = read_url_file(path)
+    if not triples:
+        return
+    unique = list(dict.fromkeys(triples))
+    executor = ThreadPoolExecutor(max_workers=_worker_count(len(unique)))
+    try:
+        futures = {triple: executor.submit(_process_triple, triple) for triple in unique}
+        seen = set()
+        for triple in triples:
+            rec = futures[triple].result()
+            if triple in seen:
+                rec = copy.deepcopy(rec)
+            seen.add(triple)
+            yield rec
+    finally:
+        # Drop queued lines if the caller stops early or a line fails.
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def handle_input_file(path: str) -> List[Dict[str, Any]]:
+    """High-level orchestrator:
+    - For each line (code,dataset,model), call GenAI for metrics.
+    - If dataset URL present and valid HF, compute dataset_quality via HF.
+    - If dataset URL missing/invalid, set dataset_url_flag=False and invoke GenAI dataset discovery; if found, compute HF dataset_quality.
+    Returns list of flat records ready for NDJSON emission, in input order
+    (see iter_input_file to consume them as they are produced).
+    """
+    return list(iter_input_file(path))
 
 
 if __name__ == "__main__":
-    import sys
     if len(sys.argv) < 2:
         print("Usage: python -m src.url_handler <input_file>")
         sys.exit(2)
-    out = handle_input_file(sys.argv[1])
-    for rec in out:
+    for rec in iter_input_file(sys.argv[1]):
         print(json.dumps(rec, ensure_ascii=False))
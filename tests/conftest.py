@@ -0,0 +1,20 @@
+import pytest
+
+import http_session
+import src.HF_API_Integration as hf_api
+
+
+@pytest.fixture(autouse=True)
+def _clear_http_cache():
+    """Keep memoized HTTP responses and license lookups from leaking between tests."""
+    http_session.clear_cache()
+    hf_api._LICENSE_CACHE.clear()
+    yield
+    http_session.clear_cache()
+    hf_api._LICENSE_CACHE.clear()
+
+
+@pytest.fixture(autouse=True)
+def _disable_llm_cache(monkeypatch):
+    """Never serve GenAI responses from a developer's on-disk cache in tests."""
+    monkeypatch.delenv("GENAI_CACHE_DB", raising=False)
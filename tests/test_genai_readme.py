@@ -11,7 +11,8 @@ from src.genai_readme_analysis import (
     _parse_llm_content_to_json,
     _flatten_metrics,
     analyze_metrics,
-    discover_dataset_url_with_genai
+    discover_dataset_url_with_genai,
+    _truncate_for_llm,
 )
 
 
@@ -30,6 +31,14 @@ class TestGenAIReadmeAnalysis:
         result = _parse_llm_content_to_json(content)
         assert result == {"ramp_up_time": 0.8, "performance_claims": 0.7}
     
+    def test_parse_llm_content_to_json_fenced_nan(self):
+        """Test fenced JSON with NaN parses the same as unfenced JSON"""
+        fenced = '```json\n{"ramp_up_time": NaN, "bus_factor": 0.5}```'
+        result = _parse_llm_content_to_json(fenced)
+        assert result["bus_factor"] == 0.5
+        assert result["ramp_up_time"] != result["ramp_up_time"]
+        assert _parse_llm_content_to_json('{"ramp_up_time": NaN, "bus_factor": 0.5}').keys() == result.keys()
+
     def test_parse_llm_content_to_json_raw(self):
         """Test parsing raw JSON from LLM response"""
         content = '{"dataset_and_code_score": 0.9, "dataset_and_code_score_latency": 150}'
@@ -56,6 +65,44 @@ class TestGenAIReadmeAnalysis:
         result = _parse_llm_content_to_json(content)
         assert result == {}
     
+    def test_parse_llm_content_to_json_with_text_after(self):
+        """Test parsing JSON followed by commentary"""
+        content = 'Result: {"ramp_up_time": 0.6, "note": "uses {braces}"} Hope this helps!'
+        result = _parse_llm_content_to_json(content)
+        assert result == {"ramp_up_time": 0.6, "note": "uses {braces}"}
+
+    def test_parse_llm_content_to_json_skips_stray_braces(self):
+        """Test that prose braces before the object are skipped"""
+        content = 'Scores for {model}: {"bus_factor": 0.3}'
+        assert _parse_llm_content_to_json(content) == {"bus_factor": 0.3}
+
+    def test_parse_llm_content_to_json_many_unbalanced_braces(self):
+        """Test long brace-heavy output without a JSON object returns empty dict"""
+        content = "{" * 50000 + " no json here"
+        assert _parse_llm_content_to_json(content) == {}
+
+    def test_truncate_for_llm_keeps_short_text(self):
+        """Test that context under the limit is passed through unchanged"""
+        assert _truncate_for_llm("short readme", max_chars=100) == "short readme"
+
+    def test_truncate_for_llm_keeps_head_and_tail(self):
+        """Test that long context keeps its start and end around a marker"""
+        text = "H" * 700 + "M" * 1000 + "T" * 200
+        result = _truncate_for_llm(text, max_chars=1000)
+        assert result.startswith("H" * 700 + "\n")
+        assert result.endswith("\n" + "T" * 200)
+        assert "[truncated 1000 chars]" in result
+        assert "M" not in result
+
+    @patch('src.genai_readme_analysis.SESSION.post')
+    def test_analyze_with_genai_truncates_long_readme(self, mock_post):
+        """Test that a huge README is cut down before it is sent"""
+        mock_post.return_value.json.return_value = {"choices": [{"message": {"content": "{}"}}]}
+        analyze_with_genai(readme="x" * 100000, model="test/model")
+        prompt = mock_post.call_args[1]["json"]["messages"][0]["content"]
+        assert len(prompt) < 20000
+        assert "[truncated" in prompt
+
     def test_flatten_metrics_simple(self):
         """Test flattening simple metrics"""
         metrics = {
@@ -119,7 +166,7 @@ class TestGenAIReadmeAnalysis:
         assert result["performance_claims"] is None
         assert result["dataset_and_code_score"] == 0.5
     
-    @patch('src.genai_readme_analysis.requests.post')
+    @patch('src.genai_readme_analysis.SESSION.post')
     def test_analyze_with_genai_success(self, mock_post):
         """Test successful GenAI API call"""
         mock_response = Mock()
@@ -151,7 +198,13 @@ class TestGenAIReadmeAnalysis:
         assert "Authorization" in call_args[1]["headers"]
         assert call_args[1]["timeout"] == 5.0
     
-    @patch('src.genai_readme_analysis.requests.post')
+    def test_genai_calls_share_pooled_session(self):
+        """GenAI requests reuse the keep-alive session used for HF calls"""
+        import http_session
+        import src.genai_readme_analysis as gra
+        assert gra.SESSION is http_session.SESSION
+
+    @patch('src.genai_readme_analysis.SESSION.post')
     def test_analyze_with_genai_timeout(self, mock_post):
         """Test GenAI API call with timeout"""
         import requests
@@ -160,7 +213,7 @@ class TestGenAIReadmeAnalysis:
         with pytest.raises(requests.exceptions.Timeout):
             analyze_with_genai(readme="Test")
     
-    @patch('src.genai_readme_analysis.requests.post')
+    @patch('src.genai_readme_analysis.SESSION.post')
     def test_analyze_with_genai_http_error(self, mock_post):
         """Test GenAI API call with HTTP error"""
         import requests
@@ -228,7 +281,7 @@ class TestGenAIReadmeAnalysis:
         result = analyze_metrics(readme="Test")
         assert result == {}
     
-    @patch('src.genai_readme_analysis.requests.post')
+    @patch('src.genai_readme_analysis.SESSION.post')
     def test_discover_dataset_url_with_genai_success(self, mock_post):
         """Test successful dataset URL discovery"""
         mock_response = Mock()
@@ -252,7 +305,7 @@ class TestGenAIReadmeAnalysis:
         assert result["dataset_url"] == "https://huggingface.co/datasets/squad/squad_v2"
         assert result["dataset_discovery_latency"] == 250
     
-    @patch('src.genai_readme_analysis.requests.post')
+    @patch('src.genai_readme_analysis.SESSION.post')
     def test_discover_dataset_url_empty(self, mock_post):
         """Test dataset discovery with no dataset found"""
         mock_response = Mock()
@@ -273,7 +326,7 @@ class TestGenAIReadmeAnalysis:
         assert "dataset_url" not in result  # Empty strings are not included
         assert result["dataset_discovery_latency"] == 100
     
-    @patch('src.genai_readme_analysis.requests.post')
+    @patch('src.genai_readme_analysis.SESSION.post')
     def test_discover_dataset_url_api_error(self, mock_post):
         """Test dataset discovery with API error"""
         import requests
@@ -282,7 +335,7 @@ class TestGenAIReadmeAnalysis:
         with pytest.raises(requests.exceptions.RequestException):
             discover_dataset_url_with_genai(readme="Test")
     
-    @patch('src.genai_readme_analysis.requests.post')
+    @patch('src.genai_readme_analysis.SESSION.post')
     def test_discover_dataset_url_invalid_response(self, mock_post):
         """Test dataset discovery with invalid response structure"""
         mock_response = Mock()
@@ -292,12 +345,31 @@ class TestGenAIReadmeAnalysis:
         result = discover_dataset_url_with_genai(readme="Test")
         assert result == {}
     
+    @patch('src.genai_readme_analysis.SESSION.post')
+    def test_discover_dataset_url_undecodable_body(self, mock_post):
+        """Test dataset discovery treats a non-JSON body as no dataset"""
+        import requests
+        mock_response = Mock()
+        mock_response.json.side_effect = requests.exceptions.JSONDecodeError("Expecting value", "<html>", 0)
+        mock_post.return_value = mock_response
+
+        assert discover_dataset_url_with_genai(readme="Test") == {}
+
+    @patch('src.genai_readme_analysis.SESSION.post')
+    def test_discover_dataset_url_invalid_header_propagates(self, mock_post):
+        """Test request errors that subclass ValueError are not swallowed"""
+        import requests
+        mock_post.side_effect = requests.exceptions.InvalidHeader("bad header")
+
+        with pytest.raises(requests.exceptions.InvalidHeader):
+            discover_dataset_url_with_genai(readme="Test")
+
     def test_api_key_from_environment(self):
         """Test that API key can be set from environment"""
         test_key = "test-key-12345"
         os.environ["GEN_AI_STUDIO_API_KEY"] = test_key
         
-        with patch('src.genai_readme_analysis.requests.post') as mock_post:
+        with patch('src.genai_readme_analysis.SESSION.post') as mock_post:
             mock_response = Mock()
             mock_response.json.return_value = {"choices": [{"message": {"content": "{}"}}]}
             mock_post.return_value = mock_response
@@ -23,3 +23,36 @@ class TestHFAPIIntegration:
     def test_missing_helpers_raise_attribute_error(self):
         with pytest.raises(AttributeError):
             getattr(hf, "get_huggingface_model_metadata")
+
+    def test_get_license_info_memoizes_success(self):
+        expected = {"model_id": "owner/cached", "license": "mit", "lgplv21_compat_score": 1}
+        with patch("src.HF_API_Integration.license_compat", return_value=expected) as mock_compat:
+            assert hf.get_license_info("owner/cached") == expected
+            assert hf.get_license_info("owner/cached") == expected
+            mock_compat.assert_called_once_with("owner/cached")
+
+    def test_get_license_info_does_not_cache_errors(self):
+        failed = {"model_id": "owner/flaky", "license": "error", "error": "timeout"}
+        with patch("src.HF_API_Integration.license_compat", return_value=failed) as mock_compat:
+            hf.get_license_info("owner/flaky")
+            hf.get_license_info("owner/flaky")
+            assert mock_compat.call_count == 2
+
+    def test_cached_license_reports_fresh_latency(self):
+        fetched = {"model_id": "owner/slow", "license": "mit", "license_latency": 2.5}
+        with patch("src.HF_API_Integration.license_compat", return_value=fetched):
+            assert hf.get_license_info("owner/slow")["license_latency"] == 2.5
+            again = hf.get_license_info("owner/slow")
+        assert again["license"] == "mit"
+        assert again["license_latency"] < 2.5
+
+    def test_license_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(hf, "_LICENSE_CACHE_MAXSIZE", 2)
+        with patch("src.HF_API_Integration.license_compat", side_effect=lambda m: {"model_id": m}) as mock_compat:
+            hf.get_license_info("a")
+            hf.get_license_info("b")
+            hf.get_license_info("a")
+            hf.get_license_info("c")
+            assert list(hf._LICENSE_CACHE) == ["a", "c"]
+            hf.get_license_info("b")
+            assert mock_compat.call_count == 4
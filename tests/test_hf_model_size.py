@@ -1,7 +1,9 @@
 """Tests for src.hf_model_size matching the current implementation."""
 
 import importlib.util
+import json
 import sys
+import threading
 from unittest.mock import patch, Mock
 
 
@@ -25,15 +27,15 @@ calculate_size_metric = hf_model_size.calculate_size_metric
 
 class TestHFModelSize:
     def test_basic_size_collection(self):
-        with patch('hf_model_size.requests.get') as mock_get:
+        with patch('http_session.SESSION.get') as mock_get:
             mock_resp = Mock()
             mock_resp.raise_for_status = Mock()
-            mock_resp.json.return_value = {
+            mock_resp.content = json.dumps({
                 "siblings": [
                     {"rfilename": "model.safetensors", "size": 1024},
                     {"rfilename": "config.json", "size": 256},
                 ]
-            }
+            }).encode()
             mock_get.return_value = mock_resp
 
             result = get_model_file_sizes("bert-base")
@@ -42,10 +44,10 @@ class TestHFModelSize:
         assert result["files"][0]["filename"] == "model.safetensors"
 
     def test_head_fallback(self):
-        with patch('hf_model_size.requests.get') as mock_get, patch('hf_model_size.requests.head') as mock_head:
+        with patch('http_session.SESSION.get') as mock_get, patch('hf_model_size.SESSION.head') as mock_head:
             api_resp = Mock()
             api_resp.raise_for_status = Mock()
-            api_resp.json.return_value = {"siblings": [{"rfilename": "weights.bin", "size": 0}]}
+            api_resp.content = json.dumps({"siblings": [{"rfilename": "weights.bin", "size": 0}]}).encode()
             mock_get.return_value = api_resp
 
             head_resp = Mock()
@@ -56,8 +58,34 @@ class TestHFModelSize:
 
         assert result["total_size_bytes"] == 4096
 
+    def test_head_fallback_issues_requests_concurrently(self):
+        sizes = {f"model-0000{i}.safetensors": i * 100 for i in range(1, 5)}
+        names = list(sizes)
+        barrier = threading.Barrier(len(names), timeout=5)
+
+        def fake_head(url, **kwargs):
+            # Every HEAD must be in flight at once for the barrier to release.
+            barrier.wait()
+            resp = Mock()
+            resp.headers = {"Content-Length": str(sizes[url.rsplit("/", 1)[1]])}
+            return resp
+
+        with patch('http_session.SESSION.get') as mock_get, patch('hf_model_size.SESSION.head', side_effect=fake_head):
+            api_resp = Mock()
+            api_resp.raise_for_status = Mock()
+            api_resp.content = json.dumps({
+                "siblings": [{"rfilename": n} for n in names] + [{"rfilename": "config.json", "size": 7}]
+            }).encode()
+            mock_get.return_value = api_resp
+
+            result = get_model_file_sizes("sharded")
+
+        assert result["total_size_bytes"] == 100 + 200 + 300 + 400 + 7
+        assert [f["filename"] for f in result["files"]] == names + ["config.json"]
+        assert [f["size"] for f in result["files"]] == [100, 200, 300, 400, 7]
+
     def test_get_model_file_sizes_error(self):
-        with patch('hf_model_size.requests.get') as mock_get:
+        with patch('http_session.SESSION.get') as mock_get:
             mock_get.side_effect = RuntimeError("down")
             result = get_model_file_sizes("broken")
 
@@ -75,6 +103,15 @@ class TestHFModelSize:
             "aws_server",
         }
 
+    def test_score_devices_matches_capacity_ratio(self):
+        scores = hf_model_size.score_devices(2 * 1024 ** 3)
+        assert scores == {
+            "raspberry_pi": 0.0,
+            "jetson_nano": 0.5,
+            "desktop_pc": 0.875,
+            "aws_server": 0.938,
+        }
+
     def test_calculate_size_metric_error_passthrough(self):
         info = {"model_id": "bad", "error": "fail"}
         result = calculate_size_metric(info)
@@ -85,27 +122,70 @@ class TestHFModelSize:
         result = calculate_size_metric(info)
         assert result["size_metric"] == 0.0
 
-    @patch('hf_model_size.requests.get')
-    @patch('hf_model_size.requests.head')
-    @patch('subprocess.run')
-    @patch('tempfile.mkdtemp', return_value='/tmp/repo')
-    @patch('shutil.rmtree')
-    def test_git_lfs_fallback(self, mock_rmtree, mock_mkdtemp, mock_run, mock_head, mock_get):
+    @patch('http_session.SESSION.get')
+    @patch('hf_model_size.SESSION.head')
+    def test_tree_api_fallback(self, mock_head, mock_get):
+        def fake_get(url, **kwargs):
+            resp = Mock()
+            resp.raise_for_status = Mock()
+            if "/tree/main" in url:
+                payload = [
+                    {"type": "directory", "path": "onnx"},
+                    {"type": "file", "path": "weights.bin", "size": 134,
+                     "lfs": {"oid": "abc123", "size": 2684354560, "pointerSize": 134}},
+                    {"type": "file", "path": "onnx/model.onnx", "size": 2048},
+                ]
+            else:
+                payload = {"siblings": [
+                    {"rfilename": "weights.bin", "size": 0},
+                    {"rfilename": "onnx/model.onnx"},
+                ]}
+            resp.content = json.dumps(payload).encode()
+            return resp
+
+        mock_get.side_effect = fake_get
+        mock_head.side_effect = RuntimeError("no head")
+
+        result = get_model_file_sizes("owner/model")
+
+        assert [f["size"] for f in result["files"]] == [2684354560, 2048]
+        assert result["total_size_bytes"] == 2684354560 + 2048
+        tree_url = mock_get.call_args_list[-1][0][0]
+        assert tree_url == "https://huggingface.co/api/models/owner/model/tree/main?recursive=1"
+        # The tree listing sized everything, so no per-file HEADs are sent.
+        mock_head.assert_not_called()
+
+    @patch('http_session.SESSION.get')
+    @patch('hf_model_size.SESSION.head')
+    def test_listing_sizes_need_no_fallback(self, mock_head, mock_get):
         mock_resp = Mock()
         mock_resp.raise_for_status = Mock()
-        mock_resp.json.return_value = {
-            "siblings": [{"rfilename": "weights.bin", "size": 0}]
-        }
+        mock_resp.content = json.dumps({"siblings": [
+            {"rfilename": "model.safetensors", "size": 5000, "lfs": {"size": 5000}},
+            {"rfilename": "config.json", "size": 20},
+        ]}).encode()
         mock_get.return_value = mock_resp
-        mock_head.side_effect = RuntimeError("no head")
-
-        clone_result = Mock(stdout=b"", returncode=0)
-        lfs_output = Mock(stdout=b"abc123 - weights.bin 2.5 GB\n", returncode=0)
-        mock_run.side_effect = [clone_result, lfs_output]
 
         result = get_model_file_sizes("owner/model")
 
-        expected_size = int(2.5 * (1024 ** 3))
-        assert result["files"][0]["size"] == expected_size
-        assert result["total_size_bytes"] == expected_size
-        mock_rmtree.assert_called_once_with('/tmp/repo')
+        assert result["total_size_bytes"] == 5020
+        assert mock_get.call_args[0][0] == "https://huggingface.co/api/models/owner/model?blobs=true"
+        mock_get.assert_called_once()
+        mock_head.assert_not_called()
+
+    @patch('http_session.SESSION.get')
+    def test_license_and_size_share_one_model_info_get(self, mock_get):
+        from src.license_compat import license_compat
+
+        mock_resp = Mock()
+        mock_resp.raise_for_status = Mock()
+        mock_resp.headers = {}
+        mock_resp.content = json.dumps({
+            "license": "mit",
+            "siblings": [{"rfilename": "model.safetensors", "size": 5000}],
+        }).encode()
+        mock_get.return_value = mock_resp
+
+        assert license_compat("o/m")["license"] == "mit"
+        assert get_model_file_sizes("o/m")["total_size_bytes"] == 5000
+        mock_get.assert_called_once()
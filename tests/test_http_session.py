@@ -0,0 +1,106 @@
+"""Tests for the shared pooled HTTP session."""
+
+import json
+import sys
+from unittest.mock import patch, Mock
+
+import pytest
+import requests
+
+import src.http_session as http_session
+from src.http_session import SESSION, DEFAULT_TIMEOUT, get_json, clear_cache
+
+
+def _json_response(payload):
+    resp = Mock()
+    resp.raise_for_status = Mock()
+    resp.content = json.dumps(payload).encode()
+    return resp
+
+
+class TestHTTPSession:
+    def test_adapters_mounted_with_retries(self):
+        for prefix in ("https://", "http://"):
+            adapter = SESSION.get_adapter(f"{prefix}huggingface.co")
+            assert adapter.max_retries.total == 4
+            assert 429 in adapter.max_retries.status_forcelist
+            assert adapter.max_retries.respect_retry_after_header
+
+    def test_only_idempotent_methods_retried(self):
+        retry = SESSION.get_adapter("https://huggingface.co").max_retries
+        assert "GET" in retry.allowed_methods
+        assert "POST" not in retry.allowed_methods
+
+    def test_per_host_connections_are_bounded(self):
+        adapter = SESSION.get_adapter("https://huggingface.co")
+        assert adapter._pool_block is True
+        assert adapter._pool_maxsize == 32
+
+    def test_https_and_http_share_pool(self):
+        assert SESSION.get_adapter("https://huggingface.co") is SESSION.get_adapter("http://huggingface.co")
+
+    def test_accepts_compressed_responses(self):
+        assert "gzip" in SESSION.headers["Accept-Encoding"]
+
+    def test_identifies_client(self):
+        assert SESSION.headers["User-Agent"].startswith("ECE30861Project")
+
+    def test_default_timeout_splits_connect_and_read(self):
+        connect, read = DEFAULT_TIMEOUT
+        assert connect < read
+
+    def test_disk_cache_is_opt_in(self, monkeypatch):
+        monkeypatch.delenv("HF_HTTP_CACHE", raising=False)
+        assert type(http_session._new_session()) is requests.Session
+
+    def test_disk_cache_uses_requests_cache_when_enabled(self, monkeypatch):
+        fake_cache = Mock()
+        monkeypatch.setenv("HF_HTTP_CACHE", "1")
+        monkeypatch.setitem(sys.modules, "requests_cache", fake_cache)
+        session = http_session._new_session()
+        assert session is fake_cache.CachedSession.return_value
+        assert fake_cache.CachedSession.call_args[1]["backend"] == "sqlite"
+
+    def test_disk_cache_falls_back_without_requests_cache(self, monkeypatch):
+        monkeypatch.setenv("HF_HTTP_CACHE", "1")
+        monkeypatch.setitem(sys.modules, "requests_cache", None)
+        assert type(http_session._new_session()) is requests.Session
+
+    def test_get_json_memoizes_success(self):
+        clear_cache()
+        with patch.object(SESSION, "get", return_value=_json_response({"id": "a"})) as mock_get:
+            assert get_json("https://huggingface.co/api/models/a") == {"id": "a"}
+            assert get_json("https://huggingface.co/api/models/a") == {"id": "a"}
+        mock_get.assert_called_once()
+        clear_cache()
+
+    def test_get_json_does_not_cache_errors(self):
+        clear_cache()
+        failing = Mock()
+        failing.raise_for_status.side_effect = requests.exceptions.HTTPError("503")
+        with patch.object(SESSION, "get", side_effect=[failing, _json_response({"ok": 1})]) as mock_get:
+            with pytest.raises(requests.exceptions.HTTPError):
+                get_json("https://huggingface.co/api/models/b")
+            assert get_json("https://huggingface.co/api/models/b") == {"ok": 1}
+        assert mock_get.call_count == 2
+        clear_cache()
+
+    def test_get_json_expires_after_ttl(self):
+        clear_cache()
+        with patch.object(SESSION, "get", return_value=_json_response({})) as mock_get:
+            get_json("https://huggingface.co/api/models/c", ttl=0)
+            get_json("https://huggingface.co/api/models/c", ttl=0)
+        assert mock_get.call_count == 2
+        clear_cache()
+
+    def test_get_json_revalidates_expired_entry_with_etag(self):
+        clear_cache()
+        first = _json_response({"v": 1})
+        first.headers = {"ETag": '"abc"'}
+        not_modified = Mock(status_code=304, headers={})
+        with patch.object(SESSION, "get", side_effect=[first, not_modified]) as mock_get:
+            assert get_json("https://huggingface.co/api/models/d", ttl=0) == {"v": 1}
+            assert get_json("https://huggingface.co/api/models/d", ttl=0) == {"v": 1}
+        assert mock_get.call_args_list[1][1]["headers"] == {"If-None-Match": '"abc"'}
+        not_modified.raise_for_status.assert_not_called()
+        clear_cache()
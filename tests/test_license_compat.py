@@ -1,6 +1,7 @@
 """
 Test suite for license_compat.py module
 """
+import json
 import pytest
 from unittest.mock import patch, Mock
 import requests
@@ -121,14 +122,14 @@ class TestLicenseCompat:
         }
         assert extract_license(data) == "MIT"
     
-    @patch('src.license_compat.requests.get')
+    @patch('http_session.SESSION.get')
     def test_license_compat_success(self, mock_get):
         """Test successful license compatibility check"""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             "license": "MIT",
             "cardData": None
-        }
+        }).encode()
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
         
@@ -139,13 +140,13 @@ class TestLicenseCompat:
         assert result["lgplv21_compat_score"] == 1
         assert "error" not in result
     
-    @patch('src.license_compat.requests.get')
+    @patch('http_session.SESSION.get')
     def test_license_compat_incompatible(self, mock_get):
         """Test incompatible license detection"""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             "license": "proprietary"
-        }
+        }).encode()
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
         
@@ -155,7 +156,7 @@ class TestLicenseCompat:
         assert result["license"] == "proprietary"
         assert result["lgplv21_compat_score"] == 0
     
-    @patch('src.license_compat.requests.get')
+    @patch('http_session.SESSION.get')
     def test_license_compat_network_error(self, mock_get):
         """Test handling network errors"""
         mock_get.side_effect = requests.exceptions.ConnectionError("Network error")
@@ -168,7 +169,7 @@ class TestLicenseCompat:
         assert "error" in result
         assert "Network error" in result["error"]
     
-    @patch('src.license_compat.requests.get')
+    @patch('http_session.SESSION.get')
     def test_license_compat_http_error(self, mock_get):
         """Test handling HTTP errors"""
         mock_response = Mock()
@@ -183,7 +184,7 @@ class TestLicenseCompat:
         assert "error" in result
         assert "404" in result["error"]
     
-    @patch('src.license_compat.requests.get')
+    @patch('http_session.SESSION.get')
     def test_license_compat_timeout(self, mock_get):
         """Test handling timeout errors"""
         mock_get.side_effect = requests.exceptions.Timeout("Request timed out")
@@ -195,11 +196,11 @@ class TestLicenseCompat:
         assert result["lgplv21_compat_score"] == 0
         assert "error" in result
     
-    @patch('src.license_compat.requests.get')
+    @patch('http_session.SESSION.get')
     def test_license_compat_invalid_json(self, mock_get):
         """Test handling invalid JSON response"""
         mock_response = Mock()
-        mock_response.json.side_effect = ValueError("Invalid JSON")
+        mock_response.content = b"not json"
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
         
@@ -210,17 +211,17 @@ class TestLicenseCompat:
         assert result["lgplv21_compat_score"] == 0
         assert "error" in result
     
-    @patch('src.license_compat.requests.get')
+    @patch('http_session.SESSION.get')
     def test_license_compat_complex_carddata(self, mock_get):
         """Test extracting license from complex cardData structure"""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             "license": "unknown",
             "cardData": {
                 "license": ["Apache-2.0", "MIT"],
                 "other_field": "value"
             }
-        }
+        }).encode()
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
         
@@ -0,0 +1,72 @@
+"""Tests for the opt-in GenAI response cache."""
+
+import sqlite3
+from unittest.mock import patch, Mock
+
+import llm_cache
+from src.genai_readme_analysis import analyze_with_genai, discover_dataset_url_with_genai
+
+
+def _chat_response(content):
+    resp = Mock()
+    resp.json.return_value = {"choices": [{"message": {"content": content}}]}
+    return resp
+
+
+class TestLLMCache:
+    def test_disabled_without_env(self):
+        llm_cache.store("k", {"v": 1})
+        assert llm_cache.lookup("k") is None
+
+    def test_round_trip(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GENAI_CACHE_DB", str(tmp_path / "llm.sqlite"))
+        assert llm_cache.lookup("k") is None
+        llm_cache.store("k", {"v": [1, 2]})
+        assert llm_cache.lookup("k") == {"v": [1, 2]}
+
+    def test_expired_entries_are_ignored(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GENAI_CACHE_DB", str(tmp_path / "llm.sqlite"))
+        monkeypatch.setenv("GENAI_CACHE_TTL", "-1")
+        llm_cache.store("k", {"v": 1})
+        assert llm_cache.lookup("k") is None
+
+    def test_key_depends_on_model_and_prompt(self):
+        key = llm_cache.make_key("llama3.1:latest", "prompt")
+        assert key == llm_cache.make_key("llama3.1:latest", "prompt")
+        assert key != llm_cache.make_key("llama3.1:latest", "other prompt")
+        assert key != llm_cache.make_key("other-model", "prompt")
+
+    def test_analyze_with_genai_reuses_cached_response(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GENAI_CACHE_DB", str(tmp_path / "llm.sqlite"))
+        with patch('src.genai_readme_analysis.SESSION.post', return_value=_chat_response('{"bus_factor": 0.5}')) as mock_post:
+            first = analyze_with_genai(readme="Same", model="owner/model")
+            second = analyze_with_genai(readme="Same", model="owner/model")
+            analyze_with_genai(readme="Different", model="owner/model")
+        assert first == second
+        assert mock_post.call_count == 2
+
+    def test_discover_dataset_reuses_cached_response(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GENAI_CACHE_DB", str(tmp_path / "llm.sqlite"))
+        content = '{"dataset_url": "https://huggingface.co/datasets/a/b", "dataset_discovery_latency": 5}'
+        with patch('src.genai_readme_analysis.SESSION.post', return_value=_chat_response(content)) as mock_post:
+            first = discover_dataset_url_with_genai(readme="r", model="m")
+            second = discover_dataset_url_with_genai(readme="r", model="m")
+        assert first == second == {"dataset_url": "https://huggingface.co/datasets/a/b", "dataset_discovery_latency": 5}
+        mock_post.assert_called_once()
+
+    def test_corrupt_row_is_a_miss(self, tmp_path, monkeypatch):
+        db = tmp_path / "llm.sqlite"
+        monkeypatch.setenv("GENAI_CACHE_DB", str(db))
+        llm_cache.store("k", {"v": 1})
+        with sqlite3.connect(db) as conn:
+            conn.execute("UPDATE llm_cache SET value = 'not json' WHERE key = 'k'")
+        assert llm_cache.lookup("k") is None
+
+    def test_error_payloads_are_not_cached(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GENAI_CACHE_DB", str(tmp_path / "llm.sqlite"))
+        error = Mock()
+        error.json.return_value = {"detail": "model overloaded"}
+        with patch('src.genai_readme_analysis.SESSION.post', side_effect=[error, _chat_response("{}")]) as mock_post:
+            assert analyze_with_genai(readme="Same") == {"detail": "model overloaded"}
+            assert "choices" in analyze_with_genai(readme="Same")
+        assert mock_post.call_count == 2
@@ -1,5 +1,7 @@
 """Tests for url_handler that match the current implementation."""
 
+import threading
+
 import pytest
 from unittest.mock import patch
 
@@ -8,6 +10,11 @@ from src.url_handler import (
     read_url_file,
     is_placeholder_or_non_hf_dataset,
     handle_input_file,
+    iter_input_file,
+    _extract_model_id,
+    _extract_model_name,
+    _worker_count,
+    MAX_WORKERS,
 )
 
 
@@ -25,24 +32,35 @@ class TestURLHandler:
             ("", "", "model2"),
         ]
 
+    def test_model_id_and_name_extraction(self):
+        assert _extract_model_id("https://huggingface.co/owner/model/tree/main") == "owner/model"
+        assert _extract_model_id(" owner/model ") == "owner/model"
+        assert _extract_model_name("https://huggingface.co/owner/model/tree/main") == "model"
+        assert _extract_model_name("owner/repo/main") == "repo"
+
     def test_is_placeholder(self):
         assert is_placeholder_or_non_hf_dataset("") is True
         assert is_placeholder_or_non_hf_dataset("https://huggingface.co/datasets/name") is False
         assert is_placeholder_or_non_hf_dataset("https://example.com") is True
 
+    @patch('src.url_handler.hf_model_size', None)
     @patch('src.url_handler.read_url_file')
     @patch('src.url_handler.analyze_metrics')
     @patch('src.url_handler.hf')
     def test_handle_input_file_with_metrics(self, mock_hf, mock_analyze, mock_read):
         mock_read.return_value = [("", "", "https://huggingface.co/owner/model"), ("code", "dataset", "model2")]
-        mock_analyze.side_effect = [
-            {"ramp_up_time": 0.8, "ramp_up_time_latency": 100.7},
-            {}
-        ]
-        mock_hf.get_license_info.side_effect = [
-            {"lgplv21_compat_score": 1, "license_latency": 0.05},
-            {"lgplv21_compat_score": 0, "license_latency": "bad"}
-        ]
+        # Lines are scored concurrently, so key the mocks on their input
+        # rather than on call order.
+        metrics_by_model = {
+            "https://huggingface.co/owner/model": {"ramp_up_time": 0.8, "ramp_up_time_latency": 100.7},
+            "model2": {},
+        }
+        license_by_model = {
+            "owner/model": {"lgplv21_compat_score": 1, "license_latency": 0.05},
+            "model2": {"lgplv21_compat_score": 0, "license_latency": "bad"},
+        }
+        mock_analyze.side_effect = lambda **kwargs: metrics_by_model[kwargs["model"]]
+        mock_hf.get_license_info.side_effect = lambda model_id: license_by_model[model_id]
 
         result = handle_input_file("dummy.txt")
 
@@ -51,15 +69,111 @@ class TestURLHandler:
         assert result[0]["license"] == 1
         assert result[1]["license_latency"] == 0
 
+    @patch('src.url_handler.hf_model_size', None)
     @patch('src.url_handler.read_url_file')
     @patch('src.url_handler.analyze_metrics')
-    def test_handle_input_file_error_propagates(self, mock_analyze, mock_read):
+    @patch('src.url_handler.hf')
+    def test_handle_input_file_error_propagates(self, mock_hf, mock_analyze, mock_read):
         mock_read.return_value = [("", "", "model1")]
         mock_analyze.side_effect = Exception("boom")
 
         with pytest.raises(Exception):
             handle_input_file("dummy")
 
+    @patch('src.url_handler.read_url_file')
+    @patch('src.url_handler.analyze_metrics')
+    @patch('src.url_handler.hf')
+    def test_handle_input_file_preserves_input_order(self, mock_hf, mock_analyze, mock_read):
+        models = [f"owner/model{i}" for i in range(20)]
+        mock_read.return_value = [("", "", m) for m in models]
+        mock_analyze.return_value = {}
+        mock_hf.get_license_info.return_value = {"lgplv21_compat_score": 1, "license_latency": 0}
+
+        with patch('src.url_handler.hf_model_size', None):
+            result = handle_input_file("dummy.txt")
+
+        assert [rec["name"] for rec in result] == [m.split("/")[1] for m in models]
+
+    @patch('src.url_handler.hf_model_size', None)
+    @patch('src.url_handler.read_url_file')
+    @patch('src.url_handler.analyze_metrics')
+    @patch('src.url_handler.hf')
+    def test_genai_call_overlaps_hf_lookups(self, mock_hf, mock_analyze, mock_read):
+        license_started = threading.Event()
+
+        def slow_genai(**kwargs):
+            # Only completes if the HF license lookup runs while we wait.
+            assert license_started.wait(timeout=5)
+            return {"ramp_up_time": 0.5}
+
+        def license_lookup(model_id):
+            license_started.set()
+            return {"lgplv21_compat_score": 1, "license_latency": 0}
+
+        mock_read.return_value = [("", "", "owner/model")]
+        mock_analyze.side_effect = slow_genai
+        mock_hf.get_license_info.side_effect = license_lookup
+
+        result = handle_input_file("dummy.txt")
+
+        assert result[0]["ramp_up_time"] == 0.5
+
+    @patch('src.url_handler.hf_model_size', None)
+    @patch('src.url_handler.read_url_file')
+    @patch('src.url_handler.analyze_metrics')
+    @patch('src.url_handler.hf')
+    def test_duplicate_lines_scored_once(self, mock_hf, mock_analyze, mock_read):
+        line = ("", "", "https://huggingface.co/owner/model")
+        mock_read.return_value = [line, ("", "", "owner/other"), line]
+        mock_analyze.return_value = {"ramp_up_time": 0.4}
+        mock_hf.get_license_info.return_value = {"lgplv21_compat_score": 1, "license_latency": 0}
+
+        result = handle_input_file("dummy.txt")
+
+        assert [rec["name"] for rec in result] == ["model", "other", "model"]
+        assert mock_analyze.call_count == 2
+        assert result[0] == result[2]
+        assert result[0] is not result[2]
+        assert result[0]["size_score"] is not result[2]["size_score"]
+
+    @patch('src.url_handler.read_url_file')
+    def test_iter_input_file_yields_before_later_lines_finish(self, mock_read):
+        first, second = ("", "", "owner/first"), ("", "", "owner/second")
+        mock_read.return_value = [first, second]
+        release = threading.Event()
+
+        def fake_process(triple):
+            if triple == second:
+                assert release.wait(timeout=5)
+            return {"name": triple[2]}
+
+        with patch('src.url_handler._process_triple', side_effect=fake_process):
+            records = iter_input_file("dummy.txt")
+            assert next(records) == {"name": "owner/first"}
+            release.set()
+            assert list(records) == [{"name": "owner/second"}]
+
+    @patch('src.url_handler.hf', None)
+    @patch('src.url_handler.ThreadPoolExecutor')
+    def test_genai_executor_released_when_lookup_fails(self, mock_executor_cls):
+        from src.url_handler import _process_triple
+
+        with pytest.raises(AttributeError):
+            _process_triple(("", "", "owner/model"))
+
+        mock_executor_cls.return_value.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+
+    def test_worker_count_env_override(self, monkeypatch):
+        monkeypatch.delenv("URL_HANDLER_WORKERS", raising=False)
+        assert _worker_count(100) == MAX_WORKERS
+        assert _worker_count(2) == 2
+        monkeypatch.setenv("URL_HANDLER_WORKERS", "3")
+        assert _worker_count(100) == 3
+        monkeypatch.setenv("URL_HANDLER_WORKERS", "0")
+        assert _worker_count(100) == 1
+        monkeypatch.setenv("URL_HANDLER_WORKERS", "many")
+        assert _worker_count(100) == MAX_WORKERS
+
     @patch('src.url_handler.read_url_file')
     def test_handle_input_file_empty(self, mock_read):
         mock_read.return_value = []